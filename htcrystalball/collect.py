@@ -4,7 +4,6 @@ from . import SLOTS_CONFIGURATION
 from .utils import kib_to_gib, mib_to_gib
 from typing import Union
 import json
-import htcondor
 
 
 def node_name_in_list(name: str, slots: list) -> Union[int, None]:
@@ -23,6 +22,7 @@ def format_slots(slots: list) -> dict:
     already used key:value pairs in HTCrystalball.
     """
     formatted = {"slots": []}
+    nodes = formatted["slots"]
 
     for slot in slots:
         # TODO: Check if float conversion is necessary
@@ -52,20 +52,18 @@ def format_slots(slots: list) -> dict:
             slot_size["SlotType"] = "static"
 
         slot_size["TotalSlots"] = n_slots
-        node_in_list = node_name_in_list(
-            slot["UtsnameNodename"],
-            formatted["slots"]
-        )
+        node_in_list = node_name_in_list(name, nodes)
 
         if node_in_list is not None:
-            if slot_size not in formatted["slots"][node_in_list]["slot_size"]:
-                formatted["slots"][node_in_list]["slot_size"].append(slot_size)
+            node_sizes = nodes[node_in_list]["slot_size"]
+            if slot_size not in node_sizes:
+                node_sizes.append(slot_size)
         else:
             formatted_slot = {
                 'UtsnameNodename': name,
                 'slot_size': [slot_size]
             }
-            formatted["slots"].append(formatted_slot)
+            nodes.append(formatted_slot)
 
     return formatted
 
@@ -79,6 +77,9 @@ def collect_slots(filename: Union[str, None] = None) -> dict:
     ]
 
     if filename is None:
+        # Only needed for querying a live pool, and slow to import
+        import htcondor
+
         coll = htcondor.Collector()
         content = coll.query(
             htcondor.AdTypes.Startd,
@@ -106,7 +107,7 @@ def collect_slots(filename: Union[str, None] = None) -> dict:
 
                 if key in projection:
                     if key == "Name":
-                        value = line.split('@')[0]
+                        value = value.split('@')[0]
                     slot[key] = value.replace("\"", "")
             else:
                 if slot not in status["slots"]:
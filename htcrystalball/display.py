@@ -1,7 +1,73 @@
 """Display styling functions for console output."""
 
-from rich.console import Console
-from rich.table import Table
+from functools import lru_cache
+
+SLOT_COLORS = {
+    'static': 'dark_blue',
+    'gpu': 'purple4',
+    'dynamic': 'dark_red'
+}
+
+_INPUT_COLUMNS = (
+    ("Parameter", {'style': "dim"}),
+    ("Input Value", {'justify': "right"}),
+)
+
+_NODES_COLUMNS = (
+    ("Node", {'style': "dim", 'width': 12}),
+    ("Slot Type", {}),
+    ("Total Slots", {'justify': "right"}),
+    ("Cores", {'justify': "right"}),
+    ("GPUs", {'justify': "right"}),
+    ("RAM", {'justify': "right"}),
+    ("DISK", {'justify': "right"}),
+)
+
+_PREVIEW_COLUMNS = (
+    ("Slot Type", {}),
+    ("Job fits", {'justify': "right"}),
+    ("Amount of similar jobs", {'justify': "right"}),
+    ("Wall Time on IDLE", {'justify': "right"}),
+)
+
+_VERBOSE_PREVIEW_COLUMNS = (
+    ("Node", {'style': "dim", 'width': 12}),
+    ("Slot Type", {}),
+    ("Job fits", {'justify': "right"}),
+    ("Slot usage", {'justify': "right"}),
+    ("RAM usage", {'justify': "center"}),
+    ("GPU usage", {'justify': "center"}),
+    ("Amount of similar jobs", {'justify': "right"}),
+    ("Wall Time on IDLE", {'justify': "right"}),
+)
+
+
+def new_table(header_style: str, columns: tuple):
+    """
+    Creates a rich table with the given (header, column options) pairs.
+
+    Args:
+        header_style: The style of the table header
+        columns: The column definitions to add in order
+    """
+    from rich.table import Table
+
+    table = Table(show_header=True, header_style=header_style)
+    for header, options in columns:
+        table.add_column(header, **options)
+    return table
+
+
+@lru_cache(maxsize=1)
+def get_console():
+    """
+    Creates the console shared by all print functions.
+
+    rich is only imported once something is printed, which keeps importing
+    this module cheap for callers that never display anything.
+    """
+    from rich.console import Console
+    return Console()
 
 
 def inputs(num_cpu: int, amount_ram: float, amount_disk: float, num_gpu: int,
@@ -19,10 +85,8 @@ def inputs(num_cpu: int, amount_ram: float, amount_disk: float, num_gpu: int,
         max_nodes: The user-defined maximum number of simultaneous occupied
             nodes
     """
-    console = Console()
-    table = Table(show_header=True, header_style="bold blue")
-    table.add_column("Parameter", style="dim")
-    table.add_column("Input Value", justify="right")
+    console = get_console()
+    table = new_table("bold blue", _INPUT_COLUMNS)
     table.add_row("CPUS", str(num_cpu))
     table.add_row("RAM", f'{amount_ram:.2f} GiB')
     table.add_row("STORAGE", f'{amount_disk:.2f} GiB')
@@ -30,8 +94,10 @@ def inputs(num_cpu: int, amount_ram: float, amount_disk: float, num_gpu: int,
     table.add_row("JOBS", str(num_jobs))
     table.add_row("JOB DURATION", f'{num_duration:.2f} min')
     table.add_row("MAXIMUM NODES", str(max_nodes))
-    console.print("---------------------- INPUT ----------------------")
-    console.print(table)
+    console.print(
+        "---------------------- INPUT ----------------------",
+        table
+    )
 
 
 def slots(result: dict) -> None:
@@ -41,55 +107,27 @@ def slots(result: dict) -> None:
     Args:
         result: A dictionary of slot configurations.
     """
-    console = Console()
-    table = Table(show_header=True, header_style="bold magenta")
-    table.add_column("Node", style="dim", width=12)
-    table.add_column("Slot Type")
-    table.add_column("Total Slots", justify="right")
-    table.add_column("Cores", justify="right")
-    table.add_column("GPUs", justify="right")
-    table.add_column("RAM", justify="right")
-    table.add_column("DISK", justify="right")
+    console = get_console()
+    table = new_table("bold magenta", _NODES_COLUMNS)
 
     for slot in result['slots']:
-        if slot['type'] == "static":
-            color = 'dark_blue'
-            table.add_row(
-                f"[{color}]{slot['node']}[/{color}]",
-                f"[{color}]{slot['type']}[/{color}]",
-                f"[{color}]{slot['total_slots']}[/{color}]",
-                f"[{color}]{slot['cores']}[/{color}]",
-                f"[{color}]------[/{color}]",
-                f"[{color}]{slot['ram']} GiB[/{color}]",
-                f"[{color}]{slot['disk']} GiB[/{color}]"
-            )
-
-        elif slot['type'] == "gpu":
-            color = 'purple4'
-            table.add_row(
-                f"[{color}]{slot['node']}[/{color}]",
-                f"[{color}]{slot['type']}[/{color}]",
-                f"[{color}]{slot['total_slots']}[/{color}]",
-                f"[{color}]{slot['cores']}[/{color}]",
-                f"[{color}]{slot['gpus']}[/{color}]",
-                f"[{color}]{slot['ram']} GiB[/{color}]",
-                f"[{color}]{slot['disk']} GiB[/{color}]"
-            )
-
-        else:
-            color = 'dark_red'
-            table.add_row(
-                f"[{color}]{slot['node']}[/{color}]",
-                f"[{color}]{slot['type']}[/{color}]",
-                f"[{color}]{slot['total_slots']}[/{color}]",
-                f"[{color}]{slot['cores']}[/{color}]",
-                f"[{color}]------[/{color}]",
-                f"[{color}]{slot['ram']} GiB[/{color}]",
-                f"[{color}]{slot['disk']} GiB[/{color}]"
-            )
-
-    console.print("---------------------- NODES ----------------------")
-    console.print(table)
+        color = SLOT_COLORS.get(slot['type'], 'dark_red')
+        gpus = slot['gpus'] if slot['type'] == 'gpu' else '------'
+        table.add_row(
+            slot['node'],
+            slot['type'],
+            str(slot['total_slots']),
+            str(slot['cores']),
+            str(gpus),
+            f"{slot['ram']} GiB",
+            f"{slot['disk']} GiB",
+            style=color
+        )
+
+    console.print(
+        "---------------------- NODES ----------------------",
+        table
+    )
 
 
 def results(result: dict, verbose: bool) -> None:
@@ -101,64 +139,38 @@ def results(result: dict, verbose: bool) -> None:
             for the requested job size.
         verbose: A value to extend the generated output.
     """
-    console = Console()
-    table = Table(show_header=True, header_style="bold cyan")
-
-    if verbose:
-        table.add_column("Node", style="dim", width=12)
-
-    table.add_column("Slot Type")
-    table.add_column("Job fits", justify="right")
-
-    if verbose:
-        table.add_column("Slot usage", justify="right")
-        table.add_column("RAM usage", justify="center")
-        table.add_column("GPU usage", justify="center")
-
-    table.add_column("Amount of similar jobs", justify="right")
-    table.add_column("Wall Time on IDLE", justify="right")
+    console = get_console()
+    table = new_table(
+        "bold cyan",
+        _VERBOSE_PREVIEW_COLUMNS if verbose else _PREVIEW_COLUMNS
+    )
 
     for slot in result['preview']:
-        if slot['fits'] == "YES":
-            color = 'green'
-            if verbose:
-                table.add_row(
-                    f"[{color}]{slot['name']}[/{color}]",
-                    f"[{color}]{slot['type']}[/{color}]",
-                    f"[{color}]{slot['fits']}[/{color}]",
-                    f"[{color}]{slot['core_usage']} Cores[/{color}]",
-                    f"[{color}]{slot['ram_usage']}[/{color}]",
-                    f"[{color}]{slot['gpu_usage']}[/{color}]",
-                    f"[{color}]{slot['sim_jobs']}[/{color}]",
-                    f"[{color}]{slot['wall_time_on_idle']} min[/{color}]"
-                )
-            else:
-                table.add_row(
-                    f"[{color}]{slot['type']}[/{color}]",
-                    f"[{color}]{slot['fits']}[/{color}]",
-                    f"[{color}]{slot['sim_jobs']}[/{color}]",
-                    f"[{color}]{slot['wall_time_on_idle']} min[/{color}]"
-                )
+        color = 'green' if slot['fits'] == "YES" else 'red'
+        sim_jobs = slot['sim_jobs'] or '------'
+
+        if verbose:
+            table.add_row(
+                slot['name'],
+                slot['type'],
+                slot['fits'],
+                f"{slot['core_usage']} Cores",
+                slot['ram_usage'],
+                slot['gpu_usage'],
+                str(sim_jobs),
+                f"{slot['wall_time_on_idle']} min",
+                style=color
+            )
         else:
-            color = 'red'
-            if verbose:
-                table.add_row(
-                    f"[{color}]{slot['name']}[/{color}]",
-                    f"[{color}]{slot['type']}[/{color}]",
-                    f"[{color}]{slot['fits']}[/{color}]",
-                    f"[{color}]{slot['core_usage']} Cores[/{color}]",
-                    f"[{color}]{slot['ram_usage']}[/{color}]",
-                    f"[{color}]{slot['gpu_usage']}[/{color}]",
-                    f"[{color}]{slot['sim_jobs']}[/{color}]",
-                    f"[{color}]{slot['wall_time_on_idle']} min[/{color}]"
-                )
-            else:
-                table.add_row(
-                    f"[{color}]{slot['type']}[/{color}]",
-                    f"[{color}]{slot['fits']}[/{color}]",
-                    f"[{color}]{slot['sim_jobs']}[/{color}]",
-                    f"[{color}]{slot['wall_time_on_idle']} min[/{color}]"
-                )
-
-    console.print("---------------------- PREVIEW ----------------------")
-    console.print(table)
+            table.add_row(
+                slot['type'],
+                slot['fits'],
+                str(sim_jobs),
+                f"{slot['wall_time_on_idle']} min",
+                style=color
+            )
+
+    console.print(
+        "---------------------- PREVIEW ----------------------",
+        table
+    )
@@ -2,25 +2,81 @@
 
 from . import display, SLOTS_CONFIGURATION, logger
 from .utils import split_num_str, to_minutes, to_binary_gigabyte
+from functools import lru_cache
+from os import stat
+from types import MappingProxyType
+from typing import NamedTuple, Union
+import heapq
 import math
-import json
+
+try:
+    # orjson parses larger slot configurations considerably faster
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+def node_slot(slot: dict, node_name: str) -> dict:
+    """Copies a slot for checking, adding the name of its node."""
+    return dict(slot, UtsnameNodename=node_name)
 
 
 def filter_slots(slots: dict, slot_type: str) -> list:
-    """Filters the slots stored in a dictionary according to the given type."""
+    """
+    Filters the slots stored in a dictionary according to the given type.
+
+    The returned slots are copies carrying the name of their node, the given
+    configuration is left untouched.
+    """
     result = []
     for node in slots:
         for slot in node["slot_size"]:
             if slot["SlotType"] == slot_type:
-                slot["UtsnameNodename"] = node["UtsnameNodename"]
-                result.append(slot)
+                result.append(node_slot(slot, node["UtsnameNodename"]))
 
     return result
 
 
+def partition_slots(slots: dict) -> dict:
+    """
+    Sorts the slots stored in a dictionary by type in a single pass.
+
+    Like filter_slots, the slots are copied rather than modified in place.
+    """
+    buckets = {'static': [], 'dynamic': [], 'gpu': []}
+    for node in slots:
+        name = node["UtsnameNodename"]
+        for slot in node["slot_size"]:
+            bucket = buckets.get(slot["SlotType"])
+            if bucket is not None:
+                bucket.append(node_slot(slot, name))
+
+    return buckets
+
+
+@lru_cache(maxsize=4)
+def load_slots(config_file: str, mtime: int) -> dict:
+    """
+    Loads a slots configuration file and sorts its slots by type.
+
+    The result is cached per file and modification time, so repeated
+    examinations within one session only parse the file again once it has
+    been rewritten. As the returned buckets are shared between callers, they
+    are read-only: tuples of read-only slot mappings.
+    """
+    with open(config_file, 'rb') as f:
+        buckets = partition_slots(json_loads(f.read())['slots'])
+
+    return MappingProxyType({
+        slot_type: tuple(MappingProxyType(slot) for slot in slots)
+        for slot_type, slots in buckets.items()
+    })
+
+
 def prepare(cpu: int, gpu: int, ram: str, disk: str, jobs: int,
             job_duration: str, maxnodes: int, verbose: bool,
-            config_file: str = SLOTS_CONFIGURATION) -> bool:
+            config_file: str = SLOTS_CONFIGURATION,
+            slots: Union[list, None] = None) -> bool:
     """
     Prepares for the examination of job requests.
 
@@ -37,18 +93,13 @@ def prepare(cpu: int, gpu: int, ram: str, disk: str, jobs: int,
         maxnodes:
         verbose:
         config_file: optional, alternative file path for slots configuration
+        slots: optional, an already loaded list of slots used instead of
+            reading config_file
 
     Returns:
         If all needed parameters were given
     """
 
-    with open(config_file) as f:
-        config = json.load(f)['slots']
-
-    slots_static = filter_slots(config, 'static')
-    slots_dynamic = filter_slots(config, 'dynamic')
-    slots_gpu = filter_slots(config, "gpu")
-
     [ram, ram_unit] = split_num_str(ram, 0.0, 'GiB')
     ram = to_binary_gigabyte(ram, ram_unit)
     [disk, disk_unit] = split_num_str(disk, 0.0, 'GiB')
@@ -57,20 +108,28 @@ def prepare(cpu: int, gpu: int, ram: str, disk: str, jobs: int,
     [job_duration, duration_unit] = split_num_str(job_duration, 0.0, 'min')
     job_duration = to_minutes(job_duration, duration_unit)
 
-    if cpu == 0:
-        logger.warning("No number of CPU workers given --- ABORTING")
-        return False
+    missing = [
+        message for message, value in (
+            ("No number of CPU workers given", cpu),
+            ("No RAM amount given", ram)
+        )
+        if not value
+    ]
 
-    elif ram == 0.0:
-        logger.warning("No RAM amount given --- ABORTING")
+    if missing:
+        logger.warning(f"{', '.join(missing)} --- ABORTING")
         return False
 
+    if slots is not None:
+        buckets = partition_slots(slots)
     else:
-        check_slots(
-            slots_static, slots_dynamic, slots_gpu, cpu, ram, disk, gpu, jobs,
-            job_duration, maxnodes, verbose
-        )
-        return True
+        buckets = load_slots(config_file, stat(config_file).st_mtime_ns)
+
+    check_slots(
+        buckets['static'], buckets['dynamic'], buckets['gpu'], cpu, ram,
+        disk, gpu, jobs, job_duration, maxnodes, verbose
+    )
+    return True
 
 
 def check_slots(static: list, dynamic: list, gpu: list, n_cpus: int,
@@ -95,7 +154,7 @@ def check_slots(static: list, dynamic: list, gpu: list, n_cpus: int,
         verbose: Flag to extend the output.
 
     Returns:
-
+        The checked slots and their previews as returned by compute_preview.
     """
     if verbose:
         display.inputs(
@@ -103,61 +162,127 @@ def check_slots(static: list, dynamic: list, gpu: list, n_cpus: int,
             max_nodes
         )
 
-    results = {'slots': [], 'preview': []}
+    results = compute_preview(
+        static, dynamic, gpu, n_cpus, ram, n_gpus, n_jobs, job_duration,
+        max_nodes, verbose
+    )
 
-    if n_cpus != 0 and n_gpus == 0:
-        for node in dynamic:
-            node_dict, preview_node = check_slot_by_type(
-                slot=node,
-                n_cpu=n_cpus,
-                ram=ram,
-                job_duration=job_duration,
-                n_jobs=n_jobs,
-                slot_type='dynamic'
-            )
+    if results:
+        render_preview(results, verbose)
 
-            results['slots'].append(node_dict)
-            results['preview'].append(preview_node)
-
-        for node in static:
-            node_dict, preview_node = check_slot_by_type(
-                slot=node,
-                n_cpu=n_cpus,
-                ram=ram,
-                job_duration=job_duration,
-                n_jobs=n_jobs,
-                slot_type='static'
-            )
-            results['slots'].append(node_dict)
-            results['preview'].append(preview_node)
+    return results
+
+
+def compute_preview(static: list, dynamic: list, gpu: list, n_cpus: int,
+                    ram: float, n_gpus: int, n_jobs: int,
+                    job_duration: float, max_nodes: int,
+                    verbose: bool = False,
+                    columns: Union[dict, None] = None) -> dict:
+    """
+    Checks all node/slot types for a job without printing anything.
+
+    Args:
+        static: A list of static slot configurations
+        dynamic: A list of dynamic slot configurations
+        gpu: A list of gpu slot configurations
+        n_cpus: The requested number of CPU cores
+        ram: The requested amount of RAM
+        n_gpus: The requested number of GPUs
+        n_jobs: The amount of similar jobs to execute
+        job_duration: The duration for each job to execute
+        max_nodes: The maximum number of nodes to execute the jobs
+        verbose: Optional. Whether to fill in the usage details of the slots
+        columns: Optional. The slot_columns of each slot type, to reuse them
+            across several checks of the same slots
 
+    Returns:
+        A dictionary of the checked slots and the ordered previews, or an
+        empty dictionary if no CPU cores are requested.
+    """
+    if n_cpus != 0 and n_gpus == 0:
+        buckets = (('dynamic', dynamic), ('static', static))
     elif n_cpus != 0 and n_gpus != 0:
-        for node in gpu:
-            node_dict, preview_node = check_slot_by_type(
-                slot=node,
-                n_cpu=n_cpus,
-                n_gpu=n_gpus,
-                ram=ram,
-                job_duration=job_duration,
-                n_jobs=n_jobs,
-                slot_type='gpu'
-            )
-            results['slots'].append(node_dict)
-            results['preview'].append(preview_node)
+        buckets = (('gpu', gpu),)
     else:
         return {}
 
-    results['preview'] = order_node_preview(results['preview'])
+    columns = columns or {}
+
+    # The number of checked slots is known up front, so the result lists are
+    # allocated once and filled slice by slice
+    n_total = sum(len(slots) for _, slots in buckets)
+    results = {'slots': [None] * n_total, 'preview': [None] * n_total}
+    start = 0
+
+    for slot_type, slots in buckets:
+        checked, previews = check_slot_list(
+            slots=slots,
+            n_cpu=n_cpus,
+            n_gpu=n_gpus,
+            ram=ram,
+            job_duration=job_duration,
+            n_jobs=n_jobs,
+            slot_type=slot_type,
+            verbose=False,
+            columns=columns.get(slot_type)
+        )
+        end = start + len(slots)
+        results['slots'][start:end] = checked
+        results['preview'][start:end] = previews
+        start = end
+
+    results['preview'] = order_node_preview(results['preview'], max_nodes)
+
+    if verbose:
+        # Only format the usage of the previews that are left to be shown
+        fill_usage(results['preview'], n_cpus, ram, n_gpus)
+
+    return results
 
-    if max_nodes != 0 and len(results['preview']) > max_nodes:
-        results['preview'] = results['preview'][:max_nodes]
 
+def render_preview(results: dict, verbose: bool) -> None:
+    """
+    Prints the result of compute_preview to the console.
+
+    Args:
+        results: The checked slots and their previews
+        verbose: Flag to extend the output, which needs the previews to be
+            computed with verbose as well.
+    """
     if verbose:
         display.slots(results)
 
     display.results(results, verbose)
 
-    return results
+
+def check_slots_batch(static: list, dynamic: list, gpu: list,
+                      job_shapes: list) -> list:
+    """
+    Checks several job requests against the same slots without printing.
+
+    The slot totals are gathered once for all job requests.
+
+    Args:
+        static: A list of static slot configurations
+        dynamic: A list of dynamic slot configurations
+        gpu: A list of gpu slot configurations
+        job_shapes: Tuples of (n_cpus, ram, n_gpus, n_jobs, job_duration,
+            max_nodes), one per job request
+
+    Returns:
+        A list with the result of compute_preview for each job request, in
+        the order of the given job shapes.
+    """
+    columns = {
+        'static': slot_columns(static, 'static'),
+        'dynamic': slot_columns(dynamic, 'dynamic'),
+        'gpu': slot_columns(gpu, 'gpu')
+    }
+
+    return [
+        compute_preview(static, dynamic, gpu, *shape, columns=columns)
+        for shape in job_shapes
+    ]
 
 
 def default_preview(slot_name: str, slot_type: str) -> dict:
@@ -168,7 +293,7 @@ def default_preview(slot_name: str, slot_type: str) -> dict:
         'gpu_usage': '------',
         'core_usage': '------',
         'ram_usage': '------',
-        'sim_jobs': '------',
+        'sim_jobs': 0,
         'wall_time_on_idle': 0
     }
 
@@ -189,11 +314,144 @@ def rename_slot_keys(slot: dict) -> dict:
     return renamed
 
 
+def percentage(part: float, whole: float) -> int:
+    """Computes the share of part in whole in percent, 0 if whole is 0."""
+    return round(part / whole * 100) if whole else 0
+
+
+def fill_usage(previews: list, n_cpu: int, ram: float, n_gpu: int) -> None:
+    """
+    Fills in the core, RAM, and GPU usage of checked slots for display.
+
+    The totals are taken from the previews themselves, so the formatting can
+    be limited to the previews that are actually shown. The requested amounts
+    are the same for all previews and only formatted once.
+    """
+    cpu_part = f'{n_cpu}/'
+    ram_part = f'{ram:.2f}/'
+    gpu_part = f'{n_gpu}/'
+
+    for preview in previews:
+        total_cpus = preview['total_cpus']
+        total_ram = preview['total_ram']
+        total_gpus = preview['total_gpus']
+
+        if preview['type'] == 'gpu':
+            if total_gpus >= 1:
+                preview['gpu_usage'] = (
+                    f'{gpu_part}{total_gpus} '
+                    f'({percentage(n_gpu, total_gpus)}%)'
+                )
+            else:
+                preview['gpu_usage'] = 'No GPU resource!'
+
+        preview['core_usage'] = (
+            f'{cpu_part}{total_cpus} ({percentage(n_cpu, total_cpus)}%)'
+        )
+        preview['ram_usage'] = (
+            f'{ram_part}{total_ram} GiB ({percentage(ram, total_ram)}%)'
+        )
+
+
+def times_fitting(total: float, requested: float) -> Union[int, float]:
+    """
+    Computes how often a requested amount fits into a total.
+
+    A request of nothing never limits the number of jobs, so math.inf is
+    returned instead of dividing by zero.
+    """
+    return int(total / requested) if requested else math.inf
+
+
+class SlotCapacity(NamedTuple):
+    """The outcome of checking a job against a single slot."""
+    fits: bool
+    sim_jobs: int
+    wall_time: int
+
+
+def static_rule(jobs: int, total_cpus: int, total_gpus: int,
+                total_slots: int, n_gpu: int) -> (int, int, int):
+    """Static slots offer all of their cores to similar jobs."""
+    return jobs, total_cpus, total_slots
+
+
+def dynamic_rule(jobs: int, total_cpus: int, total_gpus: int,
+                 total_slots: int, n_gpu: int) -> (int, int, int):
+    """Dynamic slots run as many similar jobs as fit their cores and RAM."""
+    return jobs, jobs, total_slots
+
+
+def gpu_rule(jobs: int, total_cpus: int, total_gpus: int,
+             total_slots: int, n_gpu: int) -> (int, int, int):
+    """GPU slots are further limited by their GPU units."""
+    jobs = min(jobs, times_fitting(total_gpus, n_gpu))
+    return jobs, jobs, total_cpus
+
+
+# Per slot type: turns the number of jobs fitting the cores and RAM of a slot
+# into the number of jobs running at once, the number of similar jobs, and
+# the number of slots the jobs are spread over
+SLOT_RULES = {
+    'static': static_rule,
+    'dynamic': dynamic_rule,
+    'gpu': gpu_rule
+}
+
+
+@lru_cache(maxsize=1024)
+def slot_capacity(total_cpus: int, total_ram: float, total_gpus: int,
+                  total_slots: int, n_cpu: int, ram: float, n_gpu: int,
+                  job_duration: float, n_jobs: int,
+                  slot_type: str) -> SlotCapacity:
+    """
+    Computes whether a job fits into a slot and how much of it can be run.
+
+    Only plain numbers go in and out, which keeps the arithmetic apart from
+    the formatting of the preview. Pools usually consist of many nodes of the
+    same few shapes, so results are cached and each distinct slot shape is
+    only computed once per job request.
+
+    Args:
+        total_cpus: The number of CPU cores of the slot
+        total_ram: The amount of RAM of the slot
+        total_gpus: The number of GPU units of the slot
+        total_slots: The number of slots of the node
+        n_cpu: The number of CPU cores for a single job
+        ram: The amount of RAM for a single job
+        n_gpu: The number of GPU units for a single job
+        job_duration: The duration for a single job to execute
+        n_jobs: The number of similar jobs to be executed
+        slot_type: The type of slot, allowed {'static', 'dynamic', 'gpu'}
+
+    Returns:
+        Whether the job fits, the number of similar jobs, and the wall time on
+        idle.
+    """
+    if n_cpu > total_cpus or ram > total_ram:
+        return SlotCapacity(False, 0, 0)
+
+    jobs = min(int(total_cpus / n_cpu), times_fitting(total_ram, ram))
+    jobs, sim_jobs, slots = SLOT_RULES[slot_type](
+        jobs, total_cpus, total_gpus, total_slots, n_gpu
+    )
+
+    if not jobs:
+        return SlotCapacity(False, 0, 0)
+
+    wall_time = 0
+
+    if job_duration != 0 and slots:
+        wall_time = math.ceil(n_jobs * job_duration / (jobs * slots))
+
+    return SlotCapacity(True, sim_jobs, wall_time)
+
+
 def check_slot_by_type(slot: dict, n_cpu: int, ram: float,
                        job_duration: float, n_jobs: int, slot_type: str,
-                       n_gpu: int = 0) -> (dict, dict):
+                       n_gpu: int = 0, verbose: bool = True) -> (dict, dict):
     """
-    Checks all dynamic slots if they fit the job.
+    Checks a single slot if it fits the job.
 
     Args:
         slot: The slot to be checked for running the specified job.
@@ -203,94 +461,147 @@ def check_slot_by_type(slot: dict, n_cpu: int, ram: float,
         n_jobs: The number of similar jobs to be executed
         slot_type: The type of slot, allowed {'static', 'dynamic', 'gpu'}
         n_gpu: Optional. The number of GPU units for a single job
+        verbose: Optional. Whether to fill in the core, RAM, and GPU usage,
+            which is only displayed in the verbose output
 
     Returns:
         A dictionary of the checked slot and a dictionary with the occupancy
         details of the slot.
     """
-    if slot_type not in ['static', 'dynamic', 'gpu']:
-        raise ValueError(f'slot_type must be static, dynamic, or gpu, '
-                         f'not {slot_type}')
+    [checked], [preview] = check_slot_list(
+        [slot], n_cpu, ram, job_duration, n_jobs, slot_type, n_gpu, verbose
+    )
+
+    return [checked, preview]
 
-    preview = default_preview(slot['UtsnameNodename'], slot_type)
 
-    total_cpus = slot['TotalSlotCpus']
-    total_ram = slot['TotalSlotMemory']
-    total_slots = slot['TotalSlots'] if slot_type == 'static' else 1
-    total_gpus = slot['TotalSlotGPUs'] if slot_type == 'gpu' else 0
-    pct_cpus = int(round((n_cpu / total_cpus) * 100, 0))
-    pct_ram = int(round((ram / total_ram) * 100, 0))
-    fits_job = n_cpu <= total_cpus and ram <= total_ram
+def slot_columns(slots: list, slot_type: str) -> (list, list, list, list):
+    """
+    Extracts the slot totals needed for checking as one list per resource.
+
+    Args:
+        slots: The slots of a single type
+        slot_type: The type of the slots, allowed {'static', 'dynamic', 'gpu'}
+
+    Returns:
+        The CPU cores, RAM, GPU units, and number of slots of each slot, in
+        the order of the given slots.
+    """
+    n_slots = len(slots)
+    cpus = [slot['TotalSlotCpus'] for slot in slots]
+    ram = [slot['TotalSlotMemory'] for slot in slots]
 
+    # Only GPU slots are guaranteed to carry a GPU count
     if slot_type == 'gpu':
-        pct_gpu = int(round((n_gpu / total_gpus) * 100, 0))
-        fits_job = fits_job and n_gpu <= total_gpus
+        gpus = [slot['TotalSlotGPUs'] for slot in slots]
+    else:
+        gpus = [0] * n_slots
 
-        if total_gpus >= 1:
-            preview['gpu_usage'] = f'{n_gpu}/{total_gpus} ({pct_gpu})%'
-        else:
-            preview['gpu_usage'] = 'No GPU resource!'
+    if slot_type == 'static':
+        total_slots = [slot['TotalSlots'] for slot in slots]
+    else:
+        total_slots = [1] * n_slots
 
-    preview['core_usage'] = f'{n_cpu}/{total_cpus} ({pct_cpus}%)'
-    preview['ram_usage'] = f'{ram:.2f}/{total_ram} GiB ({pct_ram}%)'
+    return cpus, ram, gpus, total_slots
 
-    if fits_job:
-        preview['fits'] = 'YES'
 
-        if slot_type == 'dynamic':
-            preview['sim_jobs'] = min(
-                int(total_cpus / n_cpu),
-                int(total_ram / ram)
-            )
-        elif slot_type == 'gpu':
-            preview['sim_jobs'] = min(
-                int(total_gpus / n_gpu),
-                int(total_cpus / n_cpu),
-                int(total_ram / ram)
-            )
-        elif slot_type == 'static':
-            preview['sim_jobs'] = total_cpus
+def check_slot_list(slots: list, n_cpu: int, ram: float,
+                    job_duration: float, n_jobs: int, slot_type: str,
+                    n_gpu: int = 0, verbose: bool = True,
+                    columns: Union[tuple, None] = None) -> (list, list):
+    """
+    Checks a whole list of slots of the same type in one pass.
 
-        if job_duration != 0:
-            cpu_fit = int(total_cpus / n_cpu)
-            ram_fit = int(total_ram / ram)
+    The slot totals are first gathered into one list per resource, then the
+    capacity of every slot is computed from those, and only then are the
+    result dictionaries built.
 
-            if slot_type == 'gpu':
-                gpu_fit = int(total_gpus / n_gpu)
+    Args:
+        slots: The slots to be checked for running the specified job.
+        n_cpu: The number of CPU cores for a single job
+        ram: The amount of RAM for a single job
+        job_duration: The duration for a single job to execute
+        n_jobs: The number of similar jobs to be executed
+        slot_type: The type of slot, allowed {'static', 'dynamic', 'gpu'}
+        n_gpu: Optional. The number of GPU units for a single job
+        verbose: Optional. Whether to fill in the usage details of the slots
+        columns: Optional. The slot_columns of the given slots, if already
+            gathered
 
-                if ram == 0:
-                    jobs = min(cpu_fit, gpu_fit)
-                else:
-                    jobs = min(min(cpu_fit, gpu_fit), ram_fit)
+    Returns:
+        A list of the checked slots and a list of their occupancy details,
+        both in the order of the given slots.
+    """
+    if slot_type not in SLOT_RULES:
+        raise ValueError(f'slot_type must be static, dynamic, or gpu, '
+                         f'not {slot_type}')
 
-                preview['wall_time_on_idle'] = math.ceil(
-                    (n_jobs / jobs / total_cpus) * job_duration
-                )
+    if columns is None:
+        columns = slot_columns(slots, slot_type)
 
-            elif slot_type in ['static', 'dynamic']:
-                jobs = cpu_fit if ram == 0 else min(cpu_fit, ram_fit)
-                preview['wall_time_on_idle'] = math.ceil(
-                    (n_jobs / jobs / total_slots) * job_duration
-                )
+    cpus, mem, gpus, total_slots = columns
 
+    # A job exceeding the largest slot of the list cannot fit into any of them
+    exceeds_all = not slots or n_cpu > max(cpus) or ram > max(mem) or (
+        slot_type == 'gpu' and n_gpu > max(gpus)
+    )
+
+    if exceeds_all:
+        capacities = [SlotCapacity(False, 0, 0)] * len(slots)
     else:
-        preview['fits'] = 'NO'
-        preview['sim_jobs'] = 0
+        capacities = [
+            slot_capacity(
+                total_cpus, total_ram, total_gpus, n_slots, n_cpu, ram,
+                n_gpu, job_duration, n_jobs, slot_type
+            )
+            for total_cpus, total_ram, total_gpus, n_slots
+            in zip(cpus, mem, gpus, total_slots)
+        ]
+
+    # Everything but the slot specific values is the same for all previews
+    template = default_preview('', slot_type)
+    previews = [
+        dict(
+            template,
+            name=slot['UtsnameNodename'],
+            fits='YES' if fits_job else 'NO',
+            sim_jobs=sim_jobs,
+            wall_time_on_idle=wall_time,
+            total_cpus=total_cpus,
+            total_ram=total_ram,
+            total_gpus=total_gpus
+        )
+        for slot, total_cpus, total_ram, total_gpus,
+        (fits_job, sim_jobs, wall_time)
+        in zip(slots, cpus, mem, gpus, capacities)
+    ]
+
+    if verbose:
+        fill_usage(previews, n_cpu, ram, n_gpu)
 
-    return [rename_slot_keys(slot), preview]
+    return [rename_slot_keys(slot) for slot in slots], previews
 
 
-def order_node_preview(node_preview: list) -> list:
+def sim_jobs_of(preview: dict) -> int:
+    """Returns the number of similar jobs of a checked node."""
+    return preview['sim_jobs']
+
+
+def order_node_preview(node_preview: list,
+                       max_nodes: Union[int, None] = None) -> list:
     """
     Order the list of checked nodes by fits/fits not and number of similar
     jobs descending.
 
     Args:
         node_preview: the list of checked nodes
+        max_nodes: optional, only keep this many of the best nodes
 
     Returns:
         A list of checked nodes sorted by number of similar executable jobs.
     """
-    return sorted(
-        node_preview, key=lambda nodes: (nodes["sim_jobs"]), reverse=True
-    )
+    if max_nodes:
+        # Selecting the top nodes is cheaper than sorting all of them
+        return heapq.nlargest(max_nodes, node_preview, key=sim_jobs_of)
+
+    return sorted(node_preview, key=sim_jobs_of, reverse=True)
@@ -2,11 +2,18 @@
 
 from . import __version__, collect, examine
 from .utils import validate_storage_size, validate_duration
+from functools import lru_cache
 import argparse
 import sys
 
 
-def main():
+@lru_cache(maxsize=1)
+def build_parser() -> (argparse.ArgumentParser, tuple):
+    """
+    Builds the command line parser and its sub command parsers.
+
+    The parsers are only constructed once and reused on repeated calls.
+    """
     description = (
         '%(prog)s - A crystal ball that lets you peek into the future. '
         'To get a preview for any job you are trying ot execute using '
@@ -109,13 +116,19 @@ def main():
     )
     configure_cmd.set_defaults(run=configure)
 
+    return parser, (peek_cmd, configure_cmd)
+
+
+def main():
+    parser, parsers = build_parser()
+
     # Parse arguments
     args = parser.parse_args()
 
     if not len(sys.argv) > 1:
         parser.print_help()
     else:
-        args.run(args, parsers=[peek_cmd, configure_cmd])
+        args.run(args, parsers=parsers)
 
 
 def peek(params, parsers):
@@ -128,7 +141,7 @@ def peek(params, parsers):
     examine.prepare(
         cpu=params.cpu, gpu=params.gpu, ram=params.ram, disk=params.disk,
         jobs=params.jobs, job_duration=params.time, maxnodes=params.maxnodes,
-        verbose=params.verbose
+        verbose=params.verbose, slots=slots_out['slots']
     )
 
 
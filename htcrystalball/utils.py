@@ -4,12 +4,27 @@ from . import logger
 from argparse import ArgumentTypeError
 import re
 
+_STORAGE_RE = re.compile(r"^[0-9]+([kKmMgGtTpP]i?[bB]?)$")
+_DURATION_RE = re.compile(r"^([0-9]+([dDhHmMsS]?))?$")
+
+# (multiplier, divisor) pairs keyed by lowercase unit; unknown units are
+# treated as the target unit itself
+_GIB_SCALES = {
+    "kb": (1, 10 ** 6), "k": (1, 10 ** 6), "kib": (1, 10 ** 6),
+    "mb": (1, 10 ** 3), "m": (1, 10 ** 3), "mib": (1, 10 ** 3),
+    "tb": (10 ** 3, 1), "t": (10 ** 3, 1), "tib": (10 ** 3, 1),
+    "pb": (10 ** 6, 1), "p": (10 ** 6, 1), "pib": (10 ** 6, 1),
+}
+_MINUTE_SCALES = {
+    "d": (24 * 60, 1), "dd": (24 * 60, 1),
+    "h": (60, 1), "hh": (60, 1),
+    "s": (1, 60), "ss": (1, 60),
+}
+
 
 def validate_storage_size(storage: str) -> str:
     """Validates whether disk and ram input is formatted correctly."""
-    pat = re.compile(r"^[0-9]+([kKmMgGtTpP]i?[bB]?)$")
-
-    if not pat.match(storage):
+    if not _STORAGE_RE.match(storage):
         logger.error(f'Invalid storage value given: {storage}')
         raise ArgumentTypeError(f'Invalid storage value given: {storage}')
 
@@ -18,9 +33,7 @@ def validate_storage_size(storage: str) -> str:
 
 def validate_duration(duration: str) -> str:
     """Validates time input for job duration."""
-    pat = re.compile(r"^([0-9]+([dDhHmMsS]?))?$")
-
-    if not pat.match(duration):
+    if not _DURATION_RE.match(duration):
         logger.error(f'Invalid time value given: {duration}')
         raise ArgumentTypeError(f'Invalid time value given: {duration}')
 
@@ -40,9 +53,15 @@ def split_num_str(value: str, default_num: float,
     if not value:
         return default_num, default_str
 
-    split = re.split(r'(\d*\.?\d+)', value.replace(' ', ''))
-    number = float(split[1])
-    unit = default_str if not split[2] else split[2]
+    value = value.replace(' ', '')
+    i = 0
+    n = len(value)
+
+    while i < n and (value[i].isdigit() or value[i] == '.'):
+        i += 1
+
+    number = float(value[:i]) if i else default_num
+    unit = value[i:] or default_str
 
     return number, unit
 
@@ -51,18 +70,8 @@ def to_binary_gigabyte(number: float, unit: str) -> float:
     """
     Converts number from its unit to GiB account for base2 and base10 units.
     """
-    unit = unit.lower()
-
-    if unit in ("kb", "k", "kib"):
-        return number / (10 ** 6)
-    if unit in ("mb", "m", "mib"):
-        return number / (10 ** 3)
-    if unit in ("tb", "t", "tib"):
-        return number * (10 ** 3)
-    if unit in ("pb", "p", "pib"):
-        return number * (10 ** 6)
-
-    return number
+    multiplier, divisor = _GIB_SCALES.get(unit.lower(), (1, 1))
+    return number * multiplier / divisor
 
 
 def kib_to_gib(size: float) -> float:
@@ -77,12 +86,5 @@ def mib_to_gib(size: float) -> float:
 
 def to_minutes(number: float, unit: str) -> float:
     """Converts a number from its unit to minutes."""
-    unit = unit.lower()
-    if unit in ("d", "dd"):
-        return number * 24 * 60
-    if unit in ("h", "hh"):
-        return number * 60
-    if unit in ("s", "ss"):
-        return number / 60
-
-    return number
+    multiplier, divisor = _MINUTE_SCALES.get(unit.lower(), (1, 1))
+    return number * multiplier / divisor
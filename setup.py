@@ -59,7 +59,7 @@ setup(
         ],
     },
     install_requires=[
-        'rich>=6.1.1',
+        'rich>=9.5.0',
         'htcondor>=8.8.6',
     ],
     tests_require=[
@@ -70,5 +70,9 @@ setup(
             # for converting README.md -> .rst for long description
             'pypandoc',
         ],
+        'speedups': [
+            # faster parsing of the slots configuration
+            'orjson',
+        ],
     },
 )
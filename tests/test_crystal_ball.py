@@ -1,8 +1,10 @@
 """Module for testing the htcrystalball module."""
-from htcrystalball import examine, collect, utils
-from os import path
+from htcrystalball import examine, collect, display, utils
+from contextlib import redirect_stdout
+from os import path, stat
 from pytest import fixture, raises as praises
 import argparse
+import io
 import json
 
 
@@ -150,6 +152,20 @@ def test_calc_manager(root_dir):
         maxnodes=1, verbose=True, config_file=config_file
     )
 
+    # Invalid requests are rejected before the configuration is read
+    assert not examine.prepare(
+        cpu=0, gpu=0, ram="0", disk="", jobs=1, job_duration="", maxnodes=0,
+        verbose=False, config_file=path.join(root_dir, 'missing.json')
+    )
+
+    with open(config_file) as f:
+        slots = json.load(f)['slots']
+
+    assert examine.prepare(
+        cpu=1, gpu=0, ram="10GB", disk="", jobs=1, job_duration="10m",
+        maxnodes=0, verbose=False, slots=slots
+    )
+
 
 def test_slot_config(root_dir):
     """
@@ -174,6 +190,48 @@ def test_slot_config(root_dir):
         assert examine.filter_slots(slots, "gpu")[0]["SlotType"] == "gpu"
 
 
+def test_slot_partition(root_dir):
+    """
+    Tests sorting the slots into buckets by type in a single pass.
+    :return:
+    """
+    config_file = path.join(root_dir, 'example_config.json')
+
+    with open(config_file) as f:
+        slots = json.load(f)['slots']
+
+    buckets = examine.partition_slots(slots)
+
+    for slot_type in ("static", "dynamic", "gpu"):
+        assert buckets[slot_type] == examine.filter_slots(slots, slot_type)
+
+    # The configuration itself must not be modified
+    for node in slots:
+        for slot in node["slot_size"]:
+            assert "UtsnameNodename" not in slot
+
+
+def test_slot_loading(root_dir):
+    """
+    Tests that loading a slots configuration is cached per file version.
+    :return:
+    """
+    config_file = path.join(root_dir, 'example_config.json')
+    mtime = stat(config_file).st_mtime_ns
+
+    buckets = examine.load_slots(config_file, mtime)
+
+    assert examine.load_slots(config_file, mtime) is buckets
+    assert examine.load_slots(config_file, mtime + 1) is not buckets
+    assert examine.load_slots(config_file, mtime + 1) == buckets
+
+    # The cached buckets are shared and therefore read-only
+    with praises(TypeError):
+        buckets["static"][0]["TotalSlotCpus"] = 0
+    with praises(AttributeError):
+        buckets["static"].append({})
+
+
 def test_slot_checking(root_dir):
     """
     Tests the slot checking method.
@@ -210,6 +268,158 @@ def test_slot_checking(root_dir):
     ) == {}
 
 
+def test_slot_check_verbosity(root_dir):
+    """
+    Tests that usage details are only filled in for the verbose output.
+    :return:
+    """
+    config_file = path.join(root_dir, 'example_config.json')
+
+    with open(config_file) as f:
+        slots = json.load(f)['slots']
+
+    slot = examine.filter_slots(slots, "dynamic")[0]
+    _, preview = examine.check_slot_by_type(
+        slot, 1, 10.0, 10.0, 1, "dynamic", verbose=False
+    )
+    _, preview_verbose = examine.check_slot_by_type(
+        slot, 1, 10.0, 10.0, 1, "dynamic", verbose=True
+    )
+
+    assert preview['core_usage'] == '------'
+    assert preview['ram_usage'] == '------'
+    assert preview_verbose['core_usage'] != '------'
+    assert preview_verbose['ram_usage'] != '------'
+    assert preview['fits'] == preview_verbose['fits']
+    assert preview['sim_jobs'] == preview_verbose['sim_jobs']
+
+
+def test_raw_static_slot(root_dir):
+    """
+    Tests checking a static slot as written by format_slots, which has no
+    GPU count.
+    :return:
+    """
+    config_file = path.join(root_dir, 'example_config.json')
+
+    with open(config_file) as f:
+        slots = json.load(f)['slots']
+
+    node = next(
+        node for node in slots
+        if any(size['SlotType'] == 'static' for size in node['slot_size'])
+    )
+    slot = next(
+        dict(size, UtsnameNodename=node['UtsnameNodename'])
+        for size in node['slot_size'] if size['SlotType'] == 'static'
+    )
+
+    assert 'TotalSlotGPUs' not in slot
+    _, preview = examine.check_slot_by_type(slot, 1, 1.0, 0.0, 1, 'static')
+    assert preview['fits'] == 'YES'
+
+
+def test_preview_batch(root_dir, capsys):
+    """
+    Tests that batched previews match single ones and print nothing.
+    :return:
+    """
+    config_file = path.join(root_dir, 'example_config.json')
+
+    with open(config_file) as f:
+        slots = json.load(f)['slots']
+
+    buckets = examine.partition_slots(slots)
+    static, dynamic = buckets['static'], buckets['dynamic']
+    gpu = buckets['gpu']
+    shapes = [(1, 10.0, 0, 1, 10.0, 5), (4, 20.0, 1, 10, 30.0, None),
+              (0, 10.0, 0, 1, 10.0, None)]
+
+    batch = examine.check_slots_batch(static, dynamic, gpu, shapes)
+
+    assert capsys.readouterr().out == ''
+    assert batch == [
+        examine.compute_preview(static, dynamic, gpu, *shape)
+        for shape in shapes
+    ]
+    assert len(batch[0]['preview']) == 5
+    assert batch[2] == {}
+
+
+def test_slot_capacity():
+    """
+    Tests the numeric slot check for edge cases of the requested resources.
+    :return:
+    """
+    # total_cpus, total_ram, total_gpus, total_slots, n_cpu, ram, n_gpu,
+    # job_duration, n_jobs, slot_type
+    assert examine.slot_capacity(
+        8, 16.0, 0, 1, 2, 4.0, 0, 10.0, 8, 'dynamic'
+    ) == (True, 4, 20)
+    assert examine.slot_capacity(
+        8, 16.0, 0, 1, 2, 0.0, 0, 10.0, 8, 'dynamic'
+    ) == (True, 4, 20)
+    assert examine.slot_capacity(
+        8, 16.0, 2, 1, 2, 0.0, 1, 10.0, 8, 'gpu'
+    ) == (True, 2, 5)
+    assert examine.slot_capacity(
+        1, 16.0, 0, 0, 1, 4.0, 0, 10.0, 8, 'static'
+    ) == (True, 1, 0)
+    assert examine.slot_capacity(
+        8, 16.0, 0, 1, 16, 4.0, 0, 10.0, 8, 'dynamic'
+    ) == (False, 0, 0)
+    capacity = examine.slot_capacity(
+        8, 16.0, 0, 1, 2, 4.0, 0, 10.0, 8, 'dynamic'
+    )
+    assert capacity.fits and capacity.sim_jobs == 4
+    assert capacity.wall_time == 20
+    # 7 / 100 * 100 is not exactly 7 in floating point
+    assert examine.slot_capacity(
+        100, 500.0, 0, 1, 1, 1.0, 0, 100.0, 7, 'dynamic'
+    ) == (True, 100, 7)
+
+
+def test_node_preview_order():
+    """
+    Tests ordering the checked nodes with and without a maximum of nodes.
+    :return:
+    """
+    previews = [
+        {"name": "cpu1", "sim_jobs": 2},
+        {"name": "cpu2", "sim_jobs": 8},
+        {"name": "cpu3", "sim_jobs": 0},
+        {"name": "cpu4", "sim_jobs": 8},
+    ]
+    ordered = examine.order_node_preview(previews)
+
+    assert [p["name"] for p in ordered] == ["cpu2", "cpu4", "cpu1", "cpu3"]
+    assert examine.order_node_preview(previews, 2) == ordered[:2]
+    assert examine.order_node_preview(previews, 10) == ordered
+
+
+def test_usage_formatting():
+    """
+    Tests the formatting of resource usage strings.
+    :return:
+    """
+    assert examine.percentage(1, 4) == 25
+    assert examine.percentage(1, 0) == 0
+
+    previews = [
+        {"type": "dynamic", "total_cpus": 8, "total_ram": 20, "total_gpus": 0},
+        {"type": "gpu", "total_cpus": 0, "total_ram": 40, "total_gpus": 4},
+        {"type": "gpu", "total_cpus": 8, "total_ram": 20, "total_gpus": 0},
+    ]
+    examine.fill_usage(previews, 2, 10.0, 1)
+
+    assert previews[0]["core_usage"] == "2/8 (25%)"
+    assert previews[0]["ram_usage"] == "10.00/20 GiB (50%)"
+    assert "gpu_usage" not in previews[0]
+    assert previews[1]["core_usage"] == "2/0 (0%)"
+    assert previews[1]["gpu_usage"] == "1/4 (25%)"
+    assert previews[2]["gpu_usage"] == "No GPU resource!"
+
+
 def test_slot_result(root_dir):
     """
     Tests the result slots for correct number of similar jobs based on RAM
@@ -221,11 +431,12 @@ def test_slot_result(root_dir):
         slots = json.load(f)['slots']
 
     ram = 10.0
+    # The RAM usage is only filled in for the verbose output
     result = examine.check_slots(
         examine.filter_slots(slots, "static"),
         examine.filter_slots(slots, "dynamic"),
         examine.filter_slots(slots, "gpu"),
-        1, ram, 0.0, 0, 1, 0.0, 0, verbose=False
+        1, ram, 0.0, 0, 1, 0.0, 0, verbose=True
     )
     slots = result["slots"]
     previews = result["preview"]
@@ -394,4 +605,17 @@ def test_slot_reader(root_dir):
     """
     condor_status = path.join(root_dir, 'htcondor_status_long.txt')
     slots_in = collect.collect_slots(condor_status)
+    assert slots_in["slots"][0]["Name"] == "slot1"
     collect.format_slots(slots_in["slots"])
+
+
+def test_console_redirect():
+    """
+    Tests that the shared console follows later redirects of stdout.
+    :return:
+    """
+    for _ in range(2):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            display.inputs(1, 10.0, 10.0, 0, 1, 10.0, 1)
+        assert "CPUS" in out.getvalue()